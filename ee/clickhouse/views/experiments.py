@@ -1,5 +1,9 @@
-from typing import Any, Callable, Optional
+import json
+from typing import Any, Callable, Dict, Optional, Type
 
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.utils.timezone import now
 from rest_framework import serializers, viewsets
 from rest_framework.decorators import action
@@ -29,6 +33,11 @@ from posthog.models.filters.filter import Filter
 from posthog.utils import generate_cache_key, get_safe_cache
 
 EXPERIMENT_RESULTS_CACHE_DEFAULT_TTL = 60 * 30  # 30 minutes
+EXPERIMENT_RESULTS_CACHE_FINISHED_TTL = 60 * 60 * 6  # 6 hours
+
+EXPERIMENT_RESULT_CLASSES: Dict[str, Type[ClickhouseFunnelExperimentResult | ClickhouseTrendExperimentResult]] = {
+    INSIGHT_TRENDS: ClickhouseTrendExperimentResult,
+}
 
 
 def _calculate_experiment_results(experiment: Experiment, refresh: bool = False):
@@ -40,23 +49,20 @@ def _calculate_experiment_results(experiment: Experiment, refresh: bool = False)
     if exposure_filter_data:
         exposure_filter = Filter(data={**exposure_filter_data, "is_simplified": True}, team=experiment.team)
 
-    if filter.insight == INSIGHT_TRENDS:
-        calculate_func = lambda: ClickhouseTrendExperimentResult(
-            filter,
-            experiment.team,
-            experiment.feature_flag,
-            experiment.start_date,
-            experiment.end_date,
-            custom_exposure_filter=exposure_filter,
-        ).get_results()
-    else:
-        calculate_func = lambda: ClickhouseFunnelExperimentResult(
-            filter,
-            experiment.team,
-            experiment.feature_flag,
-            experiment.start_date,
-            experiment.end_date,
-        ).get_results()
+    experiment_class = EXPERIMENT_RESULT_CLASSES.get(filter.insight, ClickhouseFunnelExperimentResult)
+    extra_kwargs: Dict[str, Any] = {}
+    if experiment_class is ClickhouseTrendExperimentResult:
+        # Only trend experiments support a custom exposure filter
+        extra_kwargs["custom_exposure_filter"] = exposure_filter
+
+    calculate_func = lambda: experiment_class(
+        filter,
+        experiment.team,
+        experiment.feature_flag,
+        experiment.start_date,
+        experiment.end_date,
+        **extra_kwargs,
+    ).get_results()
 
     return _experiment_results_cached(
         experiment,
@@ -98,8 +104,13 @@ def _experiment_results_cached(
 
     exposure_suffix = "" if not exposure_filter else f"_{exposure_filter.toJSON()}"
 
+    # Any edit to the experiment bumps `updated_at`. Feature flags have no such field, so their filters are
+    # part of the key instead. Either way, edits invalidate the cached results.
+    feature_flag_filters = json.dumps(experiment.feature_flag.filters, sort_keys=True)
+    version_suffix = f"_{experiment.updated_at.timestamp()}_{feature_flag_filters}"
+
     cache_key = generate_cache_key(
-        f"experiment_{results_type}_{cache_filter.toJSON()}_{experiment.team.pk}_{experiment.pk}{exposure_suffix}"
+        f"experiment_{results_type}_{cache_filter.toJSON()}_{experiment.team.pk}_{experiment.pk}{exposure_suffix}{version_suffix}"
     )
 
     tag_queries(cache_key=cache_key)
@@ -124,12 +135,16 @@ def _experiment_results_cached(
     timestamp = now()
     fresh_result_package = {"result": result, "last_refresh": now(), "is_cached": False}
 
+    # Results of finished experiments no longer change, so they can be kept around for longer
+    is_finished = experiment.end_date is not None and experiment.end_date < timestamp
+    ttl = EXPERIMENT_RESULTS_CACHE_FINISHED_TTL if is_finished else EXPERIMENT_RESULTS_CACHE_DEFAULT_TTL
+
     update_cached_state(
         experiment.team.pk,
         cache_key,
         timestamp,
         fresh_result_package,
-        ttl=EXPERIMENT_RESULTS_CACHE_DEFAULT_TTL,
+        ttl=ttl,
     )
 
     return fresh_result_package
@@ -175,7 +190,7 @@ class ExperimentSerializer(serializers.ModelSerializer):
         if len(variants) >= 11:
             raise ValidationError("Feature flag variants must be less than 11")
         elif len(variants) > 0:
-            if "control" not in [variant["key"] for variant in variants]:
+            if not any(variant["key"] == "control" for variant in variants):
                 raise ValidationError("Feature flag variants must contain a control variant")
 
         return value
@@ -255,14 +270,15 @@ class ExperimentSerializer(serializers.ModelSerializer):
             raise ValidationError(f"Can't update keys: {', '.join(sorted(extra_keys))} on Experiment")
 
         if "feature_flag_variants" in validated_data.get("parameters", {}):
-            if len(validated_data["parameters"]["feature_flag_variants"]) != len(feature_flag.variants):
+            # `variants` re-reads the flag filters on every access, so only read it once
+            ff_variants = feature_flag.variants
+
+            if len(validated_data["parameters"]["feature_flag_variants"]) != len(ff_variants):
                 raise ValidationError("Can't update feature_flag_variants on Experiment")
 
+            existing_variant_keys = {ff_variant["key"] for ff_variant in ff_variants}
             for variant in validated_data["parameters"]["feature_flag_variants"]:
-                if (
-                    len([ff_variant for ff_variant in feature_flag.variants if ff_variant["key"] == variant["key"]])
-                    != 1
-                ):
+                if variant["key"] not in existing_variant_keys:
                     raise ValidationError("Can't update feature_flag_variants on Experiment")
 
         properties = validated_data.get("filters", {}).get("properties")
@@ -286,7 +302,7 @@ class ClickhouseExperimentsViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet
     ordering = "-created_at"
 
     def get_queryset(self):
-        return super().get_queryset().prefetch_related("feature_flag", "created_by")
+        return super().get_queryset().select_related("feature_flag", "created_by")
 
     # ******************************************
     # /projects/:id/experiments/:experiment_id/results
@@ -296,7 +312,7 @@ class ClickhouseExperimentsViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet
     # 2. Funnel breakdown graph to display
     # ******************************************
     @action(methods=["GET"], detail=True)
-    def results(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    def results(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
         experiment: Experiment = self.get_object()
 
         refresh = request.query_params.get("refresh") is not None
@@ -306,7 +322,16 @@ class ClickhouseExperimentsViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet
 
         result = _calculate_experiment_results(experiment, refresh)
 
-        return Response(result)
+        response = Response(result)
+        # Browsers always revalidate, so edits to the experiment show up straight away, but polling for results
+        # that haven't changed since gets a body-less 304. `is_cached` differs between otherwise identical responses.
+        etag_content = json.dumps(
+            {key: value for key, value in result.items() if key != "is_cached"}, sort_keys=True, default=str
+        )
+        etag = quote_etag(generate_cache_key(etag_content))
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return get_conditional_response(request, etag=etag, response=response) or response
 
     # ******************************************
     # /projects/:id/experiments/:experiment_id/secondary_results?id=<secondary_metric_id>
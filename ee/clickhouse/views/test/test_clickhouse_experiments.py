@@ -1690,6 +1690,8 @@ class ClickhouseTestFunnelExperimentResults(ClickhouseTestMixin, APILicensedTest
 
         response = self.client.get(f"/api/projects/{self.team.id}/experiments/{id}/results")
         self.assertEqual(200, response.status_code)
+        self.assertEqual(response["Cache-Control"], "private, max-age=0, must-revalidate")
+        etag = response["ETag"]
 
         response_json = response.json()
         response_data = response_json["result"]
@@ -1729,6 +1731,42 @@ class ClickhouseTestFunnelExperimentResults(ClickhouseTestMixin, APILicensedTest
         self.assertEqual(response2_json.pop("is_cached"), True)
         self.assertEqual(response2_json["result"], response_data)
 
+        # unchanged results are revalidated without sending the body again
+        self.assertEqual(response2["ETag"], etag)
+        not_modified_response = self.client.get(
+            f"/api/projects/{self.team.id}/experiments/{id}/results", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # editing the experiment invalidates the cached results
+        response = self.client.patch(
+            f"/api/projects/{self.team.id}/experiments/{id}",
+            {"description": "Bazinga"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response3 = self.client.get(f"/api/projects/{self.team.id}/experiments/{id}/results")
+        self.assertEqual(200, response3.status_code)
+
+        response3_json = response3.json()
+
+        self.assertEqual(response3_json.pop("is_cached"), False)
+        self.assertNotEqual(response3["ETag"], etag)
+
+        response4 = self.client.get(f"/api/projects/{self.team.id}/experiments/{id}/results")
+
+        self.assertEqual(response4.json().pop("is_cached"), True)
+
+        # editing the feature flag invalidates the cached results too
+        feature_flag = FeatureFlag.objects.get(team=self.team, key=ff_key)
+        feature_flag.filters["multivariate"]["variants"][0]["name"] = "Renamed Control"
+        feature_flag.save()
+
+        response5 = self.client.get(f"/api/projects/{self.team.id}/experiments/{id}/results")
+        self.assertEqual(200, response5.status_code)
+
+        self.assertEqual(response5.json().pop("is_cached"), False)
+
     @snapshot_clickhouse_queries
     def test_experiment_flow_with_event_results_and_events_out_of_time_range_timezones(self):
         journeys_for(
@@ -111,8 +111,8 @@ class ValidateSchemaInputs:
 
 
 @activity.defn
-async def validate_schema_activity(inputs: ValidateSchemaInputs) -> None:
-    await validate_schema_and_update_table(
+async def validate_schema_activity(inputs: ValidateSchemaInputs) -> str | None:
+    last_successful_job_id = await validate_schema_and_update_table(
         run_id=inputs.run_id,
         team_id=inputs.team_id,
         schemas=inputs.schemas,
@@ -124,6 +124,26 @@ async def validate_schema_activity(inputs: ValidateSchemaInputs) -> None:
         f"Validated schema for external data job {inputs.run_id}",
     )
 
+    return last_successful_job_id
+
+
+@dataclasses.dataclass
+class DeleteExternalDataJobBucketInputs:
+    team_id: int
+    job_id: str
+
+
+@activity.defn
+async def delete_external_data_job_bucket(inputs: DeleteExternalDataJobBucketInputs) -> None:
+    job: ExternalDataJob = await get_external_data_job(job_id=inputs.job_id)
+
+    await sync_to_async(job.delete_data_in_bucket)()
+
+    logger = await bind_temporal_worker_logger(team_id=inputs.team_id)
+    logger.info(
+        f"Deleted deprecated data in bucket for external data job {inputs.job_id}",
+    )
+
 
 @dataclasses.dataclass
 class ExternalDataWorkflowInputs:
@@ -263,6 +283,8 @@ class ExternalDataJobWorkflow(PostHogWorkflow):
             id=run_id, run_id=run_id, status=ExternalDataJob.Status.COMPLETED, latest_error=None, team_id=inputs.team_id
         )
 
+        delete_bucket_handle = None
+
         try:
             job_inputs = ExternalDataJobInputs(
                 source_id=inputs.external_data_source_id,
@@ -284,13 +306,22 @@ class ExternalDataJobWorkflow(PostHogWorkflow):
                 run_id=run_id, team_id=inputs.team_id, schemas=schemas, table_schema=table_schemas
             )
 
-            await workflow.execute_activity(
+            last_successful_job_id = await workflow.execute_activity(
                 validate_schema_activity,
                 validate_inputs,
                 start_to_close_timeout=dt.timedelta(minutes=10),
                 retry_policy=RetryPolicy(maximum_attempts=2),
             )
 
+            # clean up data from the previous run without blocking the job status update
+            if last_successful_job_id:
+                delete_bucket_handle = workflow.start_activity(
+                    delete_external_data_job_bucket,
+                    DeleteExternalDataJobBucketInputs(team_id=inputs.team_id, job_id=last_successful_job_id),
+                    start_to_close_timeout=dt.timedelta(minutes=10),
+                    retry_policy=RetryPolicy(maximum_attempts=2),
+                )
+
         except exceptions.ActivityError as e:
             if isinstance(e.cause, exceptions.CancelledError):
                 update_inputs.status = ExternalDataJob.Status.CANCELLED
@@ -321,3 +352,11 @@ class ExternalDataJobWorkflow(PostHogWorkflow):
                     non_retryable_error_types=["NotNullViolation", "IntegrityError", "DoesNotExist"],
                 ),
             )
+
+        if delete_bucket_handle:
+            try:
+                await delete_bucket_handle
+            except exceptions.ActivityError as e:
+                logger.error(
+                    f"Data Warehouse: Could not delete deprecated data for external data source {inputs.external_data_source_id} with error: {e.cause}"
+                )
@@ -7,10 +7,12 @@ from django.test import override_settings
 
 from posthog.temporal.data_imports.external_data_job import (
     CreateExternalDataJobInputs,
+    DeleteExternalDataJobBucketInputs,
     UpdateExternalDataJobStatusInputs,
     ValidateSchemaInputs,
     create_external_data_job,
     create_external_data_job_model,
+    delete_external_data_job_bucket,
     run_external_data_job,
     update_external_data_job_model,
     validate_schema_activity,
@@ -20,7 +22,11 @@ from posthog.temporal.data_imports.external_data_job import (
     ExternalDataJobInputs,
     ExternalDataWorkflowInputs,
 )
+from posthog.warehouse.data_load import validate_schema as validate_schema_module
+from posthog.warehouse.data_load.validate_schema import _process_schema
+from posthog.temporal.common.clickhouse import ClickHouseError
 from posthog.warehouse.models import (
+    get_external_data_job,
     get_latest_run_if_exists,
     DataWarehouseTable,
     ExternalDataJob,
@@ -128,6 +134,16 @@ async def _create_schema(schema_name: str, source: ExternalDataSource, team: Tea
     )
 
 
+async def _assert_schema_linked_to_table(schema_id: str, table_name: str, job: ExternalDataJob) -> DataWarehouseTable:
+    schema = await sync_to_async(ExternalDataSchema.objects.select_related("table").get)(id=schema_id)
+
+    assert schema.table is not None
+    assert schema.table.name == table_name
+    assert schema.last_synced_at == job.created_at
+
+    return schema.table
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
 async def test_create_external_job_activity(activity_environment, team, **kwargs):
@@ -219,6 +235,36 @@ async def test_update_external_job_activity(activity_environment, team, **kwargs
     assert new_job.status == ExternalDataJob.Status.COMPLETED
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_delete_external_data_job_bucket_activity(activity_environment, team, **kwargs):
+    """
+    Test that the delete bucket activity deletes the data of the given job
+    """
+    new_source = await sync_to_async(ExternalDataSource.objects.create)(
+        source_id=uuid.uuid4(),
+        connection_id=uuid.uuid4(),
+        destination_id=uuid.uuid4(),
+        team=team,
+        status="running",
+        source_type="Stripe",
+    )
+
+    old_job = await sync_to_async(ExternalDataJob.objects.create)(
+        team_id=team.id,
+        pipeline_id=new_source.pk,
+        status=ExternalDataJob.Status.COMPLETED,
+        rows_synced=0,
+    )
+
+    inputs = DeleteExternalDataJobBucketInputs(team_id=team.id, job_id=str(old_job.id))
+
+    with mock.patch.object(ExternalDataJob, "delete_data_in_bucket") as mock_delete_data_in_bucket:
+        await activity_environment.run(delete_external_data_job_bucket, inputs)
+
+    mock_delete_data_in_bucket.assert_called_once()
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
 async def test_run_stripe_job(activity_environment, team, minio_client, **kwargs):
@@ -506,7 +552,7 @@ async def test_validate_schema_and_update_table_activity(activity_environment, t
     ]
 
     with mock.patch(
-        "posthog.warehouse.models.table.DataWarehouseTable.get_columns"
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for"
     ) as mock_get_columns, override_settings(**AWS_BUCKET_MOCK_SETTINGS):
         mock_get_columns.return_value = {"id": "string"}
         await activity_environment.run(
@@ -525,11 +571,14 @@ async def test_validate_schema_and_update_table_activity(activity_environment, t
             ),
         )
 
-        assert mock_get_columns.call_count == 10
+        assert mock_get_columns.call_count == 5
         assert (
             await sync_to_async(DataWarehouseTable.objects.filter(external_data_source_id=new_source.pk).count)() == 5
         )
 
+        for schema_id, schema_name in schemas:
+            await _assert_schema_linked_to_table(schema_id, f"stripe_{schema_name}", new_job)
+
 
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
@@ -590,7 +639,7 @@ async def test_validate_schema_and_update_table_activity_with_existing(activity_
     ]
 
     with mock.patch(
-        "posthog.warehouse.models.table.DataWarehouseTable.get_columns"
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for"
     ) as mock_get_columns, override_settings(**AWS_BUCKET_MOCK_SETTINGS):
         mock_get_columns.return_value = {"id": "string"}
         await activity_environment.run(
@@ -609,11 +658,86 @@ async def test_validate_schema_and_update_table_activity_with_existing(activity_
             ),
         )
 
-        assert mock_get_columns.call_count == 10
+        assert mock_get_columns.call_count == 5
         assert (
             await sync_to_async(DataWarehouseTable.objects.filter(external_data_source_id=new_source.pk).count)() == 5
         )
 
+        updated_table = await _assert_schema_linked_to_table(test_1_schema.id, "stripe_test-1", new_job)
+        assert updated_table.id == existing_table.id
+        assert updated_table.url_pattern == await sync_to_async(new_job.url_pattern_by_schema)("test-1")
+
+        for schema_id, schema_name in schemas[1:]:
+            await _assert_schema_linked_to_table(schema_id, f"stripe_stripe_{schema_name}", new_job)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_validate_schema_and_update_table_activity_partial_failure(activity_environment, team, **kwargs):
+    new_source = await sync_to_async(ExternalDataSource.objects.create)(
+        source_id=uuid.uuid4(),
+        connection_id=uuid.uuid4(),
+        destination_id=uuid.uuid4(),
+        team=team,
+        status="running",
+        source_type="Stripe",
+        job_inputs={"stripe_secret_key": "test-key"},
+    )
+
+    new_job = await sync_to_async(ExternalDataJob.objects.create)(
+        team_id=team.id,
+        pipeline_id=new_source.pk,
+        status=ExternalDataJob.Status.RUNNING,
+        rows_synced=0,
+    )
+
+    test_1_schema = await _create_schema("test-1", new_source, team)
+    test_2_schema = await _create_schema("test-2", new_source, team)
+    test_3_schema = await _create_schema("test-3", new_source, team)
+    schemas = [
+        (test_1_schema.id, "test-1"),
+        (test_2_schema.id, "test-2"),
+        (test_3_schema.id, "test-3"),
+    ]
+
+    original_acreate_datawarehousetable = validate_schema_module.acreate_datawarehousetable
+
+    async def acreate_datawarehousetable(**kwargs):
+        if kwargs["name"] == "stripe_test-2":
+            raise ValueError("Could not create table")
+        return await original_acreate_datawarehousetable(**kwargs)
+
+    with mock.patch(
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for"
+    ) as mock_get_columns, mock.patch.object(
+        validate_schema_module, "acreate_datawarehousetable", side_effect=acreate_datawarehousetable
+    ), override_settings(**AWS_BUCKET_MOCK_SETTINGS):
+        mock_get_columns.return_value = {"id": "string"}
+
+        with pytest.raises(ValueError, match="Could not create table"):
+            await activity_environment.run(
+                validate_schema_activity,
+                ValidateSchemaInputs(
+                    run_id=new_job.pk,
+                    team_id=team.id,
+                    schemas=schemas,
+                    table_schema={
+                        "test-1": {"name": "test-1", "resource": "test-1", "columns": {"id": {"data_type": "text"}}},
+                        "test-2": {"name": "test-2", "resource": "test-2", "columns": {"id": {"data_type": "text"}}},
+                        "test-3": {"name": "test-3", "resource": "test-3", "columns": {"id": {"data_type": "text"}}},
+                    },
+                ),
+            )
+
+    # the failing schema doesn't stop the others from being processed and saved
+    assert await sync_to_async(DataWarehouseTable.objects.filter(external_data_source_id=new_source.pk).count)() == 2
+    await _assert_schema_linked_to_table(test_1_schema.id, "stripe_test-1", new_job)
+    await _assert_schema_linked_to_table(test_3_schema.id, "stripe_test-3", new_job)
+
+    failed_schema = await sync_to_async(ExternalDataSchema.objects.get)(id=test_2_schema.id)
+    assert failed_schema.table_id is None
+    assert failed_schema.last_synced_at is None
+
 
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
@@ -635,7 +759,9 @@ async def test_validate_schema_and_update_table_activity_half_run(activity_envir
         rows_synced=0,
     )
 
-    with mock.patch("posthog.warehouse.models.table.DataWarehouseTable.get_columns") as mock_get_columns, mock.patch(
+    with mock.patch(
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for"
+    ) as mock_get_columns, mock.patch(
         "posthog.warehouse.data_load.validate_schema.validate_schema",
     ) as mock_validate, override_settings(**AWS_BUCKET_MOCK_SETTINGS):
         mock_get_columns.return_value = {"id": "string"}
@@ -653,6 +779,7 @@ async def test_validate_schema_and_update_table_activity_half_run(activity_envir
                 "name": "test_schema",
                 "url_pattern": "test_url_pattern",
                 "team_id": team.pk,
+                "columns": {"id": "string"},
             },
         ]
 
@@ -681,12 +808,77 @@ async def test_validate_schema_and_update_table_activity_half_run(activity_envir
             ),
         )
 
-        assert mock_get_columns.call_count == 1
+        assert mock_get_columns.call_count == 0
         assert (
             await sync_to_async(DataWarehouseTable.objects.filter(external_data_source_id=new_source.pk).count)() == 1
         )
 
 
+@pytest.mark.parametrize(
+    "error, expected_log",
+    [
+        (
+            ClickHouseError("DESCRIBE TABLE", "Code: 636. DB::Exception: Cannot extract table structure"),
+            "No data for schema",
+        ),
+        (ClickHouseError("DESCRIBE TABLE", "Code: 499. DB::Exception: S3 exception"), "Could not validate schema"),
+        (Exception("Something went wrong"), "Could not validate schema"),
+    ],
+)
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_process_schema_skips_schema_that_fails_validation(team, error, expected_log, **kwargs):
+    new_source = await sync_to_async(ExternalDataSource.objects.create)(
+        source_id=uuid.uuid4(),
+        connection_id=uuid.uuid4(),
+        destination_id=uuid.uuid4(),
+        team=team,
+        status="running",
+        source_type="Stripe",
+        job_inputs={"stripe_secret_key": "test-key"},
+    )
+
+    new_job = await sync_to_async(ExternalDataJob.objects.create)(
+        team_id=team.id,
+        pipeline_id=new_source.pk,
+        status=ExternalDataJob.Status.RUNNING,
+        rows_synced=0,
+    )
+    job = await get_external_data_job(job_id=new_job.pk)
+
+    credential = await sync_to_async(DataWarehouseCredential.objects.create)(
+        team=team,
+        access_key=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+        access_secret=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+    )
+
+    test_schema = await _create_schema("test-1", new_source, team)
+    logger = mock.MagicMock()
+
+    with mock.patch(
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for", side_effect=error
+    ) as mock_get_columns:
+        schema_model = await _process_schema(
+            _schema_id=test_schema.id,
+            _schema_name="test-1",
+            job=job,
+            credential=credential,
+            last_successful_job=None,
+            logger=logger,
+            team_id=team.id,
+            table_schema={},
+            table_name_prefix="stripe_",
+            semaphore=asyncio.Semaphore(1),
+            clickhouse_client=mock.MagicMock(),
+        )
+
+    assert mock_get_columns.call_count == 1
+    assert schema_model is None
+    logger.exception.assert_called_once()
+    assert expected_log in logger.exception.call_args.args[0]
+    assert await sync_to_async(DataWarehouseTable.objects.filter(external_data_source_id=new_source.pk).count)() == 0
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
 async def test_create_schema_activity(activity_environment, team, **kwargs):
@@ -721,7 +913,7 @@ async def test_create_schema_activity(activity_environment, team, **kwargs):
     ]
 
     with mock.patch(
-        "posthog.warehouse.models.table.DataWarehouseTable.get_columns"
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for"
     ) as mock_get_columns, override_settings(**AWS_BUCKET_MOCK_SETTINGS):
         mock_get_columns.return_value = {"id": "string"}
         await activity_environment.run(
@@ -740,7 +932,7 @@ async def test_create_schema_activity(activity_environment, team, **kwargs):
             ),
         )
 
-        assert mock_get_columns.call_count == 10
+        assert mock_get_columns.call_count == 5
         all_tables = DataWarehouseTable.objects.all()
         table_length = await sync_to_async(len)(all_tables)
         assert table_length == 5
@@ -781,6 +973,7 @@ async def test_external_data_job_workflow_blank(team, **kwargs):
                         update_external_data_job_model,
                         run_external_data_job,
                         validate_schema_activity,
+                        delete_external_data_job_bucket,
                     ],
                     workflow_runner=UnsandboxedWorkflowRunner(),
                 ):
@@ -831,7 +1024,7 @@ async def test_external_data_job_workflow_with_schema(team, **kwargs):
         pass
 
     with mock.patch(
-        "posthog.warehouse.models.table.DataWarehouseTable.get_columns", return_value={"id": "string"}
+        "posthog.warehouse.models.table.DataWarehouseTable.aget_columns_for", return_value={"id": "string"}
     ), mock.patch.object(DataImportPipeline, "run", mock_async_func):
         with override_settings(AIRBYTE_BUCKET_KEY="test-key", AIRBYTE_BUCKET_SECRET="test-secret"):
             async with await WorkflowEnvironment.start_time_skipping() as activity_environment:
@@ -844,6 +1037,7 @@ async def test_external_data_job_workflow_with_schema(team, **kwargs):
                         update_external_data_job_model,
                         run_external_data_job,
                         validate_schema_activity,
+                        delete_external_data_job_bucket,
                     ],
                     workflow_runner=UnsandboxedWorkflowRunner(),
                 ):
@@ -1331,5 +1331,9 @@ def label_for_team_id_to_track(team_id: int) -> str:
     return "unknown"
 
 
+CAMEL_CASE_BOUNDARY_REGEX = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+@lru_cache(maxsize=1024)
 def camel_to_snake_case(name: str) -> str:
-    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    return CAMEL_CASE_BOUNDARY_REGEX.sub("_", name).lower()
@@ -1,3 +1,6 @@
+import asyncio
+import re
+
 from django.conf import settings
 from dlt.common.schema.typing import TSchemaTables
 from dlt.common.data_types.typing import TDataType
@@ -18,17 +21,24 @@ from posthog.warehouse.models import (
     get_external_data_job,
     asave_datawarehousetable,
     acreate_datawarehousetable,
-    asave_external_data_schema,
+    abulk_update_external_data_schemas,
     get_table_by_schema_id,
     aget_schema_by_id,
 )
 from posthog.warehouse.models.external_data_job import ExternalDataJob
+from posthog.warehouse.models.external_data_schema import ExternalDataSchema
 from posthog.temporal.common.logger import bind_temporal_worker_logger
-from clickhouse_driver.errors import ServerException
-from asgiref.sync import sync_to_async
+from structlog.typing import FilteringBoundLogger
+from posthog.temporal.common.clickhouse import ClickHouseClient, ClickHouseError, get_client
 from typing import Dict, Tuple, Type
 from posthog.utils import camel_to_snake_case
 
+# ClickHouse error returned when the S3 url pattern doesn't match any files (CANNOT_EXTRACT_TABLE_STRUCTURE)
+CLICKHOUSE_NO_DATA_ERROR_REGEX = re.compile(r"\bCode: 636\b")
+
+# Bounds the number of schemas validated at once so we don't stampede ClickHouse
+MAX_CONCURRENT_SCHEMA_VALIDATIONS = 8
+
 
 def dlt_to_hogql_type(dlt_type: TDataType | None) -> str:
     hogql_type: Type[DatabaseField] = DatabaseField
@@ -64,18 +74,20 @@ def dlt_to_hogql_type(dlt_type: TDataType | None) -> str:
 
 
 async def validate_schema(
-    credential: DataWarehouseCredential, table_name: str, new_url_pattern: str, team_id: int
+    credential: DataWarehouseCredential,
+    table_name: str,
+    new_url_pattern: str,
+    team_id: int,
+    clickhouse_client: ClickHouseClient | None = None,
 ) -> Dict:
-    params = {
-        "credential": credential,
-        "name": table_name,
-        "format": "Parquet",
-        "url_pattern": new_url_pattern,
-        "team_id": team_id,
-    }
-
-    table = DataWarehouseTable(**params)
-    table.columns = await sync_to_async(table.get_columns)(safe_expose_ch_error=False)
+    columns = await DataWarehouseTable.aget_columns_for(
+        credential=credential,
+        url_pattern=new_url_pattern,
+        format="Parquet",
+        team_id=team_id,
+        safe_expose_ch_error=False,
+        client=clickhouse_client,
+    )
 
     return {
         "credential": credential,
@@ -83,12 +95,13 @@ async def validate_schema(
         "format": "Parquet",
         "url_pattern": new_url_pattern,
         "team_id": team_id,
+        "columns": columns,
     }
 
 
 async def validate_schema_and_update_table(
     run_id: str, team_id: int, schemas: list[Tuple[str, str]], table_schema: TSchemaTables
-) -> None:
+) -> str | None:
     """
 
     Validates the schemas of data that has been synced by external data job.
@@ -98,6 +111,9 @@ async def validate_schema_and_update_table(
         run_id: The id of the external data job
         team_id: The id of the team
         schemas: The list of schemas that have been synced by the external data job
+
+    Returns:
+        The id of the last successful external data job, whose data in the bucket is now deprecated
     """
 
     logger = await bind_temporal_worker_logger(team_id=team_id)
@@ -111,53 +127,105 @@ async def validate_schema_and_update_table(
         access_secret=settings.AIRBYTE_BUCKET_SECRET,
     )
 
-    for _schema in schemas:
-        _schema_id = _schema[0]
-        _schema_name = _schema[1]
+    # shared by every schema, so resolve it once up front
+    table_name_prefix = f"{job.pipeline.prefix or ''}{job.pipeline.source_type}_".lower()
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCHEMA_VALIDATIONS)
+
+    # One client for all schemas, so concurrent validations reuse its pooled HTTP connections
+    async with get_client(team_id=team_id) as clickhouse_client:
+        results = await asyncio.gather(
+            *(
+                _process_schema(
+                    _schema_id=_schema_id,
+                    _schema_name=_schema_name,
+                    job=job,
+                    credential=credential,
+                    last_successful_job=last_successful_job,
+                    logger=logger,
+                    team_id=team_id,
+                    table_schema=table_schema,
+                    table_name_prefix=table_name_prefix,
+                    semaphore=semaphore,
+                    clickhouse_client=clickhouse_client,
+                )
+                for _schema_id, _schema_name in schemas
+            ),
+            return_exceptions=True,
+        )
+
+    # update all schemas that were processed successfully in a single query
+    updated_schemas = [result for result in results if isinstance(result, ExternalDataSchema)]
+    if updated_schemas:
+        await abulk_update_external_data_schemas(updated_schemas, ["table", "last_synced_at"])
 
-        table_name = f"{job.pipeline.prefix or ''}{job.pipeline.source_type}_{_schema_name}".lower()
+    errors = [result for result in results if isinstance(result, Exception)]
+    for error in errors:
+        logger.exception(
+            f"Data Warehouse: Could not update table for external data job {job.pk}",
+            exc_info=error,
+        )
+
+    if errors:
+        raise errors[0]
+
+    return str(last_successful_job.pk) if last_successful_job else None
+
+
+async def _process_schema(
+    _schema_id: str,
+    _schema_name: str,
+    job: ExternalDataJob,
+    credential: DataWarehouseCredential,
+    last_successful_job: ExternalDataJob | None,
+    logger: FilteringBoundLogger,
+    team_id: int,
+    table_schema: TSchemaTables,
+    table_name_prefix: str,
+    semaphore: asyncio.Semaphore,
+    clickhouse_client: ClickHouseClient,
+) -> ExternalDataSchema | None:
+    """Creates or updates the table for a single schema, returning the schema model to be saved by the caller."""
+    async with semaphore:
+        table_name = f"{table_name_prefix}{_schema_name.lower()}"
         new_url_pattern = job.url_pattern_by_schema(camel_to_snake_case(_schema_name))
 
         # Check
         try:
             data = await validate_schema(
-                credential=credential, table_name=table_name, new_url_pattern=new_url_pattern, team_id=team_id
+                credential=credential,
+                table_name=table_name,
+                new_url_pattern=new_url_pattern,
+                team_id=team_id,
+                clickhouse_client=clickhouse_client,
             )
-        except ServerException as err:
-            if err.code == 636:
+        except ClickHouseError as err:
+            if CLICKHOUSE_NO_DATA_ERROR_REGEX.search(str(err)):
                 logger.exception(
                     f"Data Warehouse: No data for schema {_schema_name} for external data job {job.pk}",
                     exc_info=err,
                 )
-            continue
+            else:
+                logger.exception(
+                    f"Data Warehouse: Could not validate schema for external data job {job.pk}",
+                    exc_info=err,
+                )
+            return None
         except Exception as e:
             # TODO: handle other exceptions here
             logger.exception(
                 f"Data Warehouse: Could not validate schema for external data job {job.pk}",
                 exc_info=e,
             )
-            continue
-
-        # create or update
-        table_created = None
-        if last_successful_job:
-            try:
-                table_created = await get_table_by_schema_id(_schema_id, team_id)
-                if not table_created:
-                    raise DataWarehouseTable.DoesNotExist
-            except Exception:
-                table_created = None
-            else:
-                table_created.url_pattern = new_url_pattern
-                await asave_datawarehousetable(table_created)
+            return None
 
-        if not table_created:
-            table_created = await acreate_datawarehousetable(external_data_source_id=job.pipeline.id, **data)
+        # columns were already fetched from ClickHouse during validation
+        db_columns: Dict[str, str] = data.pop("columns")
 
+        columns = None
         for schema in table_schema.values():
             if schema.get("resource") == _schema_name:
                 schema_columns = schema.get("columns") or {}
-                db_columns: Dict[str, str] = await sync_to_async(table_created.get_columns)()
 
                 columns = {}
                 for column_name, db_column_type in db_columns.items():
@@ -172,10 +240,19 @@ async def validate_schema_and_update_table(
                         "clickhouse": db_column_type,
                         "hogql": hogql_type,
                     }
-                table_created.columns = columns
                 break
 
-        await asave_datawarehousetable(table_created)
+        # create or update, writing the table only once
+        table_created = await get_table_by_schema_id(_schema_id, team_id) if last_successful_job else None
+        if table_created:
+            table_created.url_pattern = new_url_pattern
+            if columns is not None:
+                table_created.columns = columns
+            await asave_datawarehousetable(table_created)
+        else:
+            if columns is not None:
+                data["columns"] = columns
+            table_created = await acreate_datawarehousetable(external_data_source_id=job.pipeline_id, **data)
 
         # schema could have been deleted by this point
         schema_model = await aget_schema_by_id(schema_id=_schema_id, team_id=job.team_id)
@@ -183,14 +260,5 @@ async def validate_schema_and_update_table(
         if schema_model:
             schema_model.table = table_created
             schema_model.last_synced_at = job.created_at
-            await asave_external_data_schema(schema_model)
 
-    if last_successful_job:
-        try:
-            last_successful_job.delete_data_in_bucket()
-        except Exception as e:
-            logger.exception(
-                f"Data Warehouse: Could not delete deprecated data source {last_successful_job.pk}",
-                exc_info=e,
-            )
-            pass
+        return schema_model
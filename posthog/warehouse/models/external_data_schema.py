@@ -31,6 +31,11 @@ def asave_external_data_schema(schema: ExternalDataSchema) -> None:
     schema.save()
 
 
+@database_sync_to_async
+def abulk_update_external_data_schemas(schemas: list[ExternalDataSchema], fields: list[str]) -> None:
+    ExternalDataSchema.objects.bulk_update(schemas, fields)
+
+
 def get_schema_if_exists(schema_name: str, team_id: int, source_id: uuid.UUID) -> ExternalDataSchema | None:
     schema = ExternalDataSchema.objects.filter(team_id=team_id, source_id=source_id, name=schema_name).first()
     return schema
@@ -1,4 +1,6 @@
-from typing import Dict
+import json
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, Optional
 from django.db import models
 
 from posthog.client import sync_execute
@@ -28,6 +30,9 @@ from uuid import UUID
 from sentry_sdk import capture_exception
 from posthog.warehouse.util import database_sync_to_async
 
+if TYPE_CHECKING:
+    from posthog.temporal.common.clickhouse import ClickHouseClient
+
 CLICKHOUSE_HOGQL_MAPPING = {
     "UUID": StringDatabaseField,
     "String": StringDatabaseField,
@@ -65,6 +70,12 @@ STR_TO_HOGQL_MAPPING = {
     "StringJSONDatabaseField": StringJSONDatabaseField,
 }
 
+DESCRIBE_S3_TABLE_QUERY = """DESCRIBE TABLE (
+    SELECT * FROM
+        s3(%(url_pattern)s, %(access_key)s, %(access_secret)s, %(format)s)
+    LIMIT 1
+)"""
+
 ExtractErrors = {
     "The AWS Access Key Id you provided does not exist": "The Access Key you provided does not exist",
 }
@@ -101,17 +112,7 @@ class DataWarehouseTable(CreatedMetaFields, UUIDModel, DeletedMetaFields):
     def get_columns(self, safe_expose_ch_error=True) -> Dict[str, str]:
         try:
             result = sync_execute(
-                """DESCRIBE TABLE (
-                SELECT * FROM
-                    s3(%(url_pattern)s, %(access_key)s, %(access_secret)s, %(format)s)
-                LIMIT 1
-            )""",
-                {
-                    "url_pattern": self.url_pattern,
-                    "access_key": self.credential.access_key,
-                    "access_secret": self.credential.access_secret,
-                    "format": self.format,
-                },
+                DESCRIBE_S3_TABLE_QUERY, _describe_query_params(self.credential, self.url_pattern, self.format)
             )
         except Exception as err:
             capture_exception(err)
@@ -122,6 +123,42 @@ class DataWarehouseTable(CreatedMetaFields, UUIDModel, DeletedMetaFields):
 
         return {item[0]: item[1] for item in result}
 
+    @classmethod
+    async def aget_columns_for(
+        cls,
+        credential: DataWarehouseCredential,
+        url_pattern: str,
+        format: str,
+        team_id: int,
+        safe_expose_ch_error=True,
+        client: Optional["ClickHouseClient"] = None,
+    ) -> Dict[str, str]:
+        """Same as get_columns, but runs natively on the event loop via the async ClickHouse HTTP client.
+
+        Takes the table attributes directly so callers don't need to instantiate a model just to describe it.
+        Pass a `client` to reuse its pooled HTTP connections across many calls.
+        """
+        from posthog.temporal.common.clickhouse import get_client
+
+        try:
+            async with nullcontext(client) if client is not None else get_client(team_id=team_id) as ch_client:
+                # POST rather than GET, so the S3 credentials travel in the request body and not in the URL
+                async with ch_client.apost_query(
+                    f"{DESCRIBE_S3_TABLE_QUERY} FORMAT JSONEachRow",
+                    query_parameters=_describe_query_params(credential, url_pattern, format),
+                    query_id=None,
+                ) as ch_response:
+                    response = await ch_response.content.read()
+        except Exception as err:
+            capture_exception(err)
+            if safe_expose_ch_error:
+                cls._safe_expose_ch_error(err)
+            else:
+                raise err
+
+        rows = [json.loads(line) for line in response.splitlines() if line]
+        return {row["name"]: row["type"] for row in rows}
+
     def hogql_definition(self) -> S3Table:
         if not self.columns:
             raise Exception("Columns must be fetched and saved to use in HogQL.")
@@ -163,14 +200,25 @@ class DataWarehouseTable(CreatedMetaFields, UUIDModel, DeletedMetaFields):
             structure=", ".join(structure),
         )
 
-    def _safe_expose_ch_error(self, err):
+    @staticmethod
+    def _safe_expose_ch_error(err):
         err = wrap_query_error(err)
+        message = getattr(err, "message", str(err))
         for key, value in ExtractErrors.items():
-            if key in err.message:
+            if key in message:
                 raise Exception(value)
         raise Exception("Could not get columns")
 
 
+def _describe_query_params(credential: DataWarehouseCredential, url_pattern: str, format: str) -> Dict[str, str]:
+    return {
+        "url_pattern": url_pattern,
+        "access_key": credential.access_key,
+        "access_secret": credential.access_secret,
+        "format": format,
+    }
+
+
 @database_sync_to_async
 def get_table_by_url_pattern_and_source(url_pattern: str, source_id: UUID, team_id: int) -> DataWarehouseTable:
     return DataWarehouseTable.objects.filter(Q(deleted=False) | Q(deleted__isnull=True)).get(
@@ -179,8 +227,9 @@ def get_table_by_url_pattern_and_source(url_pattern: str, source_id: UUID, team_
 
 
 @database_sync_to_async
-def get_table_by_schema_id(schema_id: str, team_id: int):
-    return ExternalDataSchema.objects.get(id=schema_id, team_id=team_id).table
+def get_table_by_schema_id(schema_id: str, team_id: int) -> DataWarehouseTable | None:
+    schema = ExternalDataSchema.objects.filter(id=schema_id, team_id=team_id).select_related("table").first()
+    return schema.table if schema else None
 
 
 @database_sync_to_async
@@ -1,8 +1,30 @@
+import contextlib
+from typing import Optional
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
 from posthog.hogql.database.models import DateTimeDatabaseField, IntegerDatabaseField, StringDatabaseField
+from posthog.temporal.common.clickhouse import ClickHouseError
 from posthog.test.base import BaseTest
 from posthog.warehouse.models import DataWarehouseCredential, DataWarehouseTable
 
 
+def _mock_clickhouse_client(body: bytes = b"", error: Optional[Exception] = None) -> mock.MagicMock:
+    client = mock.MagicMock()
+
+    @contextlib.asynccontextmanager
+    async def apost_query(query, *data, query_parameters, query_id):
+        if error is not None:
+            raise error
+        response = mock.MagicMock()
+        response.content.read = mock.AsyncMock(return_value=body)
+        yield response
+
+    client.apost_query = mock.MagicMock(side_effect=apost_query)
+    return client
+
+
 class TestTable(BaseTest):
     # Not worth actually testing this as it would involve going to a remote server, and it's slow
     # def test_get_columns(self):
@@ -105,3 +127,80 @@ class TestTable(BaseTest):
             table.hogql_definition().structure,
             "id String, timestamp DateTime64(3, 'UTC'), mrr Int64, complex_field Array(Tuple( Nullable(String),  Nullable(String),  Map(String, Nullable(String)))), tuple_field Tuple(type Nullable(String), value Nullable(String), _airbyte_additional_properties Map(String, Nullable(String))), offset UInt32",
         )
+
+    def test_aget_columns_for(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        client = _mock_clickhouse_client(
+            body=(
+                b'{"name":"id","type":"String","default_type":"","default_expression":"","comment":""}\n'
+                b'{"name":"mrr","type":"Nullable(Int64)","default_type":"","default_expression":"","comment":""}\n'
+            )
+        )
+
+        columns = async_to_sync(DataWarehouseTable.aget_columns_for)(
+            credential=credential,
+            url_pattern="https://bucket.s3.amazonaws.com/data/*.parquet",
+            format=DataWarehouseTable.TableFormat.Parquet,
+            team_id=self.team.pk,
+            client=client,
+        )
+
+        self.assertEqual(columns, {"id": "String", "mrr": "Nullable(Int64)"})
+
+        query = client.apost_query.call_args.args[0]
+        self.assertIn("DESCRIBE TABLE", query)
+        self.assertTrue(query.endswith("FORMAT JSONEachRow"))
+        self.assertEqual(
+            client.apost_query.call_args.kwargs["query_parameters"],
+            {
+                "url_pattern": "https://bucket.s3.amazonaws.com/data/*.parquet",
+                "access_key": "key",
+                "access_secret": "secret",
+                "format": DataWarehouseTable.TableFormat.Parquet,
+            },
+        )
+
+    def test_aget_columns_for_safe_exposes_error(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        client = _mock_clickhouse_client(
+            error=ClickHouseError(
+                "DESCRIBE TABLE",
+                "Code: 499. DB::Exception: The AWS Access Key Id you provided does not exist in our records.",
+            )
+        )
+
+        with self.assertRaisesMessage(Exception, "The Access Key you provided does not exist"):
+            async_to_sync(DataWarehouseTable.aget_columns_for)(
+                credential=credential,
+                url_pattern="https://bucket.s3.amazonaws.com/data/*.parquet",
+                format=DataWarehouseTable.TableFormat.Parquet,
+                team_id=self.team.pk,
+                client=client,
+            )
+
+    def test_aget_columns_for_safe_exposes_unknown_error(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        client = _mock_clickhouse_client(error=ClickHouseError("DESCRIBE TABLE", "Code: 999. DB::Exception: Oops"))
+
+        with self.assertRaisesMessage(Exception, "Could not get columns"):
+            async_to_sync(DataWarehouseTable.aget_columns_for)(
+                credential=credential,
+                url_pattern="https://bucket.s3.amazonaws.com/data/*.parquet",
+                format=DataWarehouseTable.TableFormat.Parquet,
+                team_id=self.team.pk,
+                client=client,
+            )
+
+    def test_aget_columns_for_raises_when_not_safe_exposing(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        client = _mock_clickhouse_client(error=ClickHouseError("DESCRIBE TABLE", "Code: 636. DB::Exception: No data"))
+
+        with self.assertRaises(ClickHouseError):
+            async_to_sync(DataWarehouseTable.aget_columns_for)(
+                credential=credential,
+                url_pattern="https://bucket.s3.amazonaws.com/data/*.parquet",
+                format=DataWarehouseTable.TableFormat.Parquet,
+                team_id=self.team.pk,
+                safe_expose_ch_error=False,
+                client=client,
+            )